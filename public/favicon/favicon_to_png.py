@@ -7,141 +7,178 @@ Convert SVG favicon to multiple PNG sizes with aspect ratio preservation.
 将SVG favicon转换为多个PNG尺寸，保持宽高比。
 
 Requirements:
-    pip install cairosvg pillow
+    pip install cairosvg pillow numpy lxml
+    (optional) oxipng on PATH for extra lossless PNG compression
 
 Usage:
     python favicon_to_png.py
 """
 
+import math
 import os
 import re
+import shutil
+import subprocess
 from pathlib import Path
-from typing import Tuple, List
-import cairosvg
+from typing import Iterator, List, Optional, Tuple
+from cairosvg.parser import Tree
+from cairosvg.surface import PNGSurface
+import numpy as np
+from lxml import etree
 from PIL import Image
 import io
 
+# Whitespace runs, collapsed to a single space before coordinate matching
+_WS_RE = re.compile(r"\s+")
+# Coordinate pairs like: number,number or number number (including decimals)
+_COORD_RE = re.compile(r"(-?\d+(?:\.\d+)?)[,\s]+(-?\d+(?:\.\d+)?)")
 
-def parse_path_data(path_data: str) -> List[Tuple[float, float]]:
+
+def parse_path_data(path_data: str) -> Iterator[Tuple[float, float]]:
     """
-    Parse SVG path data and extract all coordinate points.
-    解析SVG路径数据并提取所有坐标点。
+    Parse SVG path data and yield all coordinate points.
+    解析SVG路径数据并逐个产出所有坐标点。
 
     Args:
         path_data (str): SVG path 'd' attribute content
 
-    Returns:
-        List[Tuple[float, float]]: List of (x, y) coordinate points
+    Yields:
+        Tuple[float, float]: (x, y) coordinate points
     """
-    points = []
-
     # Remove unnecessary whitespace and normalize
-    path_data = re.sub(r"\s+", " ", path_data.strip())
+    path_data = _WS_RE.sub(" ", path_data.strip())
 
     # Extract all numeric coordinates (including decimals)
-    # This regex finds patterns like: number,number or number number
-    coordinate_pattern = r"(-?\d+(?:\.\d+)?)[,\s]+(-?\d+(?:\.\d+)?)"
-    matches = re.findall(coordinate_pattern, path_data)
+    for m in _COORD_RE.finditer(path_data):
+        yield float(m.group(1)), float(m.group(2))
 
-    for match in matches:
-        x, y = float(match[0]), float(match[1])
-        points.append((x, y))
 
-    return points
+def _local_name_xpath(*tags: str, attribute: Optional[str] = None) -> etree.XPath:
+    """
+    Build a compiled XPath matching elements by local tag name, with or without the SVG namespace.
+    构建按本地标签名匹配元素的已编译XPath，兼容有无SVG命名空间的情况。
 
+    Args:
+        *tags (str): Local tag names to match (e.g. "rect")
+        attribute (Optional[str]): Attribute to select from the matches instead of the elements
 
-def get_svg_content_bounds(svg_content: str) -> Tuple[float, float, float, float]:
+    Returns:
+        etree.XPath: Compiled XPath expression selecting the matching elements or attribute values
     """
-    Calculate the actual bounding box of SVG content.
-    计算SVG内容的实际边界框。
+    predicate = " or ".join(f"local-name()='{tag}'" for tag in tags)
+    suffix = f"/@{attribute}" if attribute else ""
+    return etree.XPath(f"//*[{predicate}]{suffix}")
+
+
+# Compiled once; each query walks the tree in libxml2 instead of Python
+_PATH_DATA_XPATH = _local_name_xpath("path", attribute="d")
+_POLY_POINTS_XPATH = _local_name_xpath("polyline", "polygon", attribute="points")
+_RECT_XPATH = _local_name_xpath("rect")
+_CIRCLE_XPATH = _local_name_xpath("circle")
+_ELLIPSE_XPATH = _local_name_xpath("ellipse")
+_LINE_XPATH = _local_name_xpath("line")
+
+
+def get_svg_content_bounds(
+    svg_content: str,
+) -> Tuple[etree._Element, Tuple[float, float, float, float]]:
+    """
+    Parse the SVG once and calculate the actual bounding box of its content.
+    解析SVG一次并计算其内容的实际边界框。
 
     Args:
         svg_content (str): SVG file content as string
 
     Returns:
-        Tuple[float, float, float, float]: (min_x, min_y, max_x, max_y)
+        Tuple[etree._Element, Tuple[float, float, float, float]]:
+            Parsed root element and (min_x, min_y, max_x, max_y)
     """
-    import xml.etree.ElementTree as ET
-
-    root = ET.fromstring(svg_content)
-    all_points = []
-
-    # Find all path elements
-    for path in root.iter():
-        if path.tag.endswith("path"):
-            d_attr = path.get("d")
-            if d_attr:
-                points = parse_path_data(d_attr)
-                all_points.extend(points)
-
-    # Find all basic shapes (rect, circle, ellipse, line, polyline, polygon)
-    for elem in root.iter():
-        tag = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-
-        if tag == "rect":
-            x = float(elem.get("x", 0))
-            y = float(elem.get("y", 0))
-            width = float(elem.get("width", 0))
-            height = float(elem.get("height", 0))
-            all_points.extend([(x, y), (x + width, y + height)])
-
-        elif tag == "circle":
-            cx = float(elem.get("cx", 0))
-            cy = float(elem.get("cy", 0))
-            r = float(elem.get("r", 0))
-            all_points.extend([(cx - r, cy - r), (cx + r, cy + r)])
-
-        elif tag == "ellipse":
-            cx = float(elem.get("cx", 0))
-            cy = float(elem.get("cy", 0))
-            rx = float(elem.get("rx", 0))
-            ry = float(elem.get("ry", 0))
-            all_points.extend([(cx - rx, cy - ry), (cx + rx, cy + ry)])
-
-        elif tag == "line":
-            x1 = float(elem.get("x1", 0))
-            y1 = float(elem.get("y1", 0))
-            x2 = float(elem.get("x2", 0))
-            y2 = float(elem.get("y2", 0))
-            all_points.extend([(x1, y1), (x2, y2)])
-
-        elif tag in ["polyline", "polygon"]:
-            points_attr = elem.get("points", "")
-            if points_attr:
-                points = parse_path_data(points_attr.replace(",", " "))
-                all_points.extend(points)
-
-    if not all_points:
+    # lxml rejects str input that carries an encoding declaration, so parse bytes
+    root = etree.fromstring(svg_content.encode("utf-8"))
+
+    # Running bounds, updated in place as path and poly points are parsed
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
+
+    point_data_list = _PATH_DATA_XPATH(root) + [
+        points.replace(",", " ") for points in _POLY_POINTS_XPATH(root)
+    ]
+    for point_data in point_data_list:
+        for x, y in parse_path_data(point_data):
+            if x < min_x:
+                min_x = x
+            if x > max_x:
+                max_x = x
+            if y < min_y:
+                min_y = y
+            if y > max_y:
+                max_y = y
+
+    # Raw attribute strings per basic shape, converted to floats in bulk below
+    rect_xywh: List[Tuple[str, str, str, str]] = [
+        (e.get("x", "0"), e.get("y", "0"), e.get("width", "0"), e.get("height", "0"))
+        for e in _RECT_XPATH(root)
+    ]
+    circle_xyr: List[Tuple[str, str, str]] = [
+        (e.get("cx", "0"), e.get("cy", "0"), e.get("r", "0"))
+        for e in _CIRCLE_XPATH(root)
+    ]
+    ellipse_xyrr: List[Tuple[str, str, str, str]] = [
+        (e.get("cx", "0"), e.get("cy", "0"), e.get("rx", "0"), e.get("ry", "0"))
+        for e in _ELLIPSE_XPATH(root)
+    ]
+    line_xyxy: List[Tuple[str, str, str, str]] = [
+        (e.get("x1", "0"), e.get("y1", "0"), e.get("x2", "0"), e.get("y2", "0"))
+        for e in _LINE_XPATH(root)
+    ]
+
+    # Expand every shape into its two bounding corners, one array per shape type
+    point_sets = []
+    if rect_xywh:
+        a = np.array(rect_xywh, dtype=np.float64)
+        point_sets += [a[:, 0:2], a[:, 0:2] + a[:, 2:4]]
+    if circle_xyr:
+        a = np.array(circle_xyr, dtype=np.float64)
+        point_sets += [a[:, 0:2] - a[:, 2:3], a[:, 0:2] + a[:, 2:3]]
+    if ellipse_xyrr:
+        a = np.array(ellipse_xyrr, dtype=np.float64)
+        point_sets += [a[:, 0:2] - a[:, 2:4], a[:, 0:2] + a[:, 2:4]]
+    if line_xyxy:
+        a = np.array(line_xyxy, dtype=np.float64)
+        point_sets.append(a.reshape(-1, 2))
+    if point_sets:
+        pts = np.concatenate(point_sets)
+        shape_min_x, shape_min_y = pts.min(axis=0).tolist()
+        shape_max_x, shape_max_y = pts.max(axis=0).tolist()
+        min_x, min_y = min(min_x, shape_min_x), min(min_y, shape_min_y)
+        max_x, max_y = max(max_x, shape_max_x), max(max_y, shape_max_y)
+
+    if min_x == math.inf:
         # Fallback to viewBox if no content found
         viewbox = root.get("viewBox")
         if viewbox:
             _, _, width, height = map(float, viewbox.split())
-            return 0, 0, width, height
+            return root, (0, 0, width, height)
         else:
-            return 0, 0, 100, 100
-
-    # Calculate bounding box
-    x_coords = [p[0] for p in all_points]
-    y_coords = [p[1] for p in all_points]
-
-    min_x, max_x = min(x_coords), max(x_coords)
-    min_y, max_y = min(y_coords), max(y_coords)
+            return root, (0, 0, 100, 100)
 
-    return min_x, min_y, max_x, max_y
+    return root, (min_x, min_y, max_x, max_y)
 
 
-def get_svg_dimensions(svg_content: str) -> Tuple[float, float]:
+def get_svg_dimensions(
+    bounds: Tuple[float, float, float, float],
+) -> Tuple[float, float]:
     """
-    Extract actual content dimensions from SVG, creating a square bounding box.
-    从SVG中提取实际内容尺寸，创建正方形边界框。
+    Derive square content dimensions from precomputed SVG content bounds.
+    根据预先计算的SVG内容边界得到正方形尺寸。
 
     Args:
-        svg_content (str): SVG file content as string
+        bounds (Tuple[float, float, float, float]): (min_x, min_y, max_x, max_y)
 
     Returns:
         Tuple[float, float]: (width, height) - always square dimensions
     """
-    min_x, min_y, max_x, max_y = get_svg_content_bounds(svg_content)
+    min_x, min_y, max_x, max_y = bounds
 
     # Calculate actual content dimensions
     content_width = max_x - min_x
@@ -159,52 +196,32 @@ def get_svg_dimensions(svg_content: str) -> Tuple[float, float]:
     return square_size, square_size
 
 
-def calculate_render_size(
-    svg_width: float, svg_height: float, target_size: int
-) -> Tuple[int, int]:
+def svg_to_image(
+    root: etree._Element,
+    bounds: Tuple[float, float, float, float],
+    width: int,
+    height: int,
+) -> Image.Image:
     """
-    Calculate the render size to fit within target_size while maintaining aspect ratio.
-    计算渲染尺寸以在目标尺寸内适配同时保持宽高比。
+    Rasterize SVG to an RGBA image with specified dimensions, cropped to actual content bounds.
+    将SVG栅格化为指定尺寸的RGBA图像，裁剪到实际内容边界。
 
-    Since we now use square dimensions, this will always return target_size x target_size.
-    由于现在使用正方形尺寸，这将总是返回target_size x target_size。
+    The parsed root is modified in place (viewBox, width and height).
+    解析后的根元素会被原地修改（viewBox、width和height）。
 
     Args:
-        svg_width (float): SVG width (should be same as height for square)
-        svg_height (float): SVG height (should be same as width for square)
-        target_size (int): Target square size (e.g., 16, 32, 128, 256)
-
-    Returns:
-        Tuple[int, int]: (render_width, render_height) - always square
-    """
-    return target_size, target_size
-
-
-def svg_to_png(
-    svg_path: str, output_path: str, width: int, height: int, svg_content: str
-) -> None:
-    """
-    Convert SVG to PNG with specified dimensions, cropped to actual content bounds.
-    将SVG转换为指定尺寸的PNG，裁剪到实际内容边界。
-
-    Args:
-        svg_path (str): Path to input SVG file
-        output_path (str): Path to output PNG file
+        root (etree._Element): Parsed SVG root element
+        bounds (Tuple[float, float, float, float]): Precomputed content bounds
         width (int): Output width in pixels
         height (int): Output height in pixels
-        svg_content (str): SVG content for calculating bounds
+
+    Returns:
+        Image.Image: Rendered RGBA image
     """
-    # Get the actual content bounds
-    min_x, min_y, max_x, max_y = get_svg_content_bounds(svg_content)
+    min_x, min_y, max_x, max_y = bounds
     content_width = max_x - min_x
     content_height = max_y - min_y
 
-    # Create a modified SVG that focuses on the content bounds
-    import xml.etree.ElementTree as ET
-
-    # Parse the original SVG
-    root = ET.fromstring(svg_content)
-
     # Calculate the square bounding box
     square_size = max(content_width, content_height)
 
@@ -221,21 +238,65 @@ def svg_to_png(
     root.set("width", str(width))
     root.set("height", str(height))
 
-    # Convert the modified SVG to string
-    modified_svg = ET.tostring(root, encoding="unicode")
-
-    # Convert SVG to PNG directly with the target size
-    png_data = cairosvg.svg2png(
-        bytestring=modified_svg.encode("utf-8"),
+    # Serialize the modified SVG straight to UTF-8 bytes for cairosvg
+    modified_svg_bytes = etree.tostring(root, encoding="utf-8")
+
+    # Build cairosvg's document tree from the bytes once and render it with the
+    # PNG surface directly, streaming the output straight into a buffer
+    tree = Tree(bytestring=modified_svg_bytes)
+    png_buffer = io.BytesIO()
+    PNGSurface(
+        tree,
+        png_buffer,
+        96,
         output_width=width,
         output_height=height,
-    )
+    ).finish()
+    png_buffer.seek(0)
+
+    return Image.open(png_buffer).convert("RGBA")
+
+
+def save_png(image: Image.Image, output_path: str) -> None:
+    """
+    Save image as a maximally compressed PNG.
+    将图像保存为最大压缩率的PNG。
+
+    If `oxipng` is available on PATH, the file is further optimized losslessly.
+    如果PATH中存在`oxipng`，会进一步对文件进行无损优化。
+
+    Args:
+        image (Image.Image): Image to save
+        output_path (str): Path to output PNG file
+    """
+    image.save(output_path, format="PNG", optimize=True, compress_level=9)
 
-    # Save the image directly
-    with open(output_path, "wb") as f:
-        f.write(png_data)
+    oxipng = shutil.which("oxipng")
+    if oxipng:
+        subprocess.run(
+            [oxipng, "-o", "4", "--strip", "safe", "-q", str(output_path)],
+            check=False,
+        )
 
-    print(f"✓ Generated {output_path} ({width}x{height}, cropped to content)")
+
+def render_one(
+    base_image: Image.Image, width: int, height: int, output_path: str
+) -> None:
+    """
+    Resize the base rendering to one target size and save it as PNG.
+    将基础渲染图缩放到单个目标尺寸并保存为PNG。
+
+    Args:
+        base_image (Image.Image): Image rendered at the largest target size
+        width (int): Output width in pixels
+        height (int): Output height in pixels
+        output_path (str): Path to output PNG file
+    """
+    if base_image.size == (width, height):
+        image = base_image
+    else:
+        image = base_image.resize((width, height), Image.Resampling.LANCZOS)
+    save_png(image, output_path)
 
 
 def main():
@@ -260,26 +321,27 @@ def main():
         svg_content = f.read()
 
     try:
-        svg_width, svg_height = get_svg_dimensions(svg_content)
+        # Parse the SVG and compute its content bounds exactly once
+        root, bounds = get_svg_content_bounds(svg_content)
+        svg_width, svg_height = get_svg_dimensions(bounds)
         print(f"📏 SVG dimensions: {svg_width} x {svg_height}")
         print(f"📐 Aspect ratio: {svg_width/svg_height:.3f}")
 
-        # Generate PNG files for each target size
+        # Rasterize once at the largest size; smaller sizes are downscaled
+        render_size = max(target_sizes)
+        print(f"🎨 Rendering base image at {render_size}x{render_size}...")
+        base_image = svg_to_image(root, bounds, render_size, render_size)
+
+        # Resize and encode each target size from the base rendering
+        # The crop is square, so every size renders at target_size x target_size
         for target_size in target_sizes:
-            render_width, render_height = calculate_render_size(
-                svg_width, svg_height, target_size
-            )
             output_path = current_dir / f"favicon-{target_size}x{target_size}.png"
 
+            print(f"🎨 Resizing {target_size}x{target_size}...")
+            render_one(base_image, target_size, target_size, str(output_path))
+
             print(
-                f"🎨 Rendering {target_size}x{target_size} (actual: {render_width}x{render_height})..."
-            )
-            svg_to_png(
-                str(svg_path),
-                str(output_path),
-                render_width,
-                render_height,
-                svg_content,
+                f"✓ Generated {output_path} ({target_size}x{target_size}, cropped to content)"
             )
 
         print("\n✨ All favicon sizes generated successfully!")
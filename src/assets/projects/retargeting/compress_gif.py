@@ -2,16 +2,260 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
+import struct
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Deque, Iterator, Optional
 
-from PIL import Image, ImageOps, ImageSequence
+from PIL import Image, ImageSequence
+
+
+def _fit_size(size: tuple[int, int], max_width: int, max_height: int) -> tuple[int, int]:
+    """Compute the largest size that fits within the bounds while keeping the aspect ratio.
+
+    Parameters
+    ----------
+    size : tuple[int, int]
+        Source ``(width, height)`` in pixels.
+    max_width : int
+        Maximum width (in pixels).
+    max_height : int
+        Maximum height (in pixels).
+
+    Returns
+    -------
+    tuple[int, int]
+        Target ``(width, height)``; sources already within the bounds are left unscaled.
+    """
+
+    width, height = size
+    scale = min(max_width / width, max_height / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class _QuantizedFrameCache:
+    """Thread-safe, size-bounded cache of palettized frames keyed by resized pixel content.
+
+    Parameters
+    ----------
+    max_entries : int
+        Number of distinct frames to retain; the oldest entry is evicted first.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[bytes, Image.Image] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[Image.Image]:
+        """Look up a palettized frame and mark it as most recently used.
+
+        Parameters
+        ----------
+        key : bytes
+            Digest of the resized frame's pixels and mode.
+
+        Returns
+        -------
+        Image.Image or None
+            Cached palettized frame, or ``None`` when the key is absent.
+        """
+
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+            return image
+
+    def put(self, key: bytes, image: Image.Image) -> None:
+        """Store a palettized frame, evicting the least recently used entries over the limit.
+
+        Parameters
+        ----------
+        key : bytes
+            Digest of the resized frame's pixels and mode.
+        image : Image.Image
+            Palettized frame to retain; callers pass a copy they will not mutate.
+
+        Returns
+        -------
+        None
+            The cache is updated in place.
+        """
+
+        with self._lock:
+            self._entries[key] = image
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+def _detach_working_frame(frame: Image.Image) -> Image.Image:
+    """Copy a decoded frame out of the GIF in the mode used for resampling.
+
+    Parameters
+    ----------
+    frame : Image.Image
+        Frame currently decoded by the source GIF; it is mutated by the next seek.
+
+    Returns
+    -------
+    Image.Image
+        Independent image in ``"RGB"``, ``"L"`` or ``"RGBA"`` mode, carrying the frame ``info``.
+    """
+
+    # The mode conversion doubles as the copy that detaches the frame from the decoder,
+    # so each frame costs a single full-size allocation. Only pay for an alpha channel
+    # when the frame can actually be transparent. Palette frames are still expanded
+    # because Pillow resizes "P" images with nearest-neighbour sampling regardless of
+    # the requested filter.
+    if frame.mode in ("RGB", "L"):
+        return frame.copy()
+    if frame.mode == "P" and "transparency" not in frame.info:
+        return frame.convert("RGB")
+    return frame.convert("RGBA")
+
+
+# Frames sampled to derive the shared palette, and the pixel budget of the sample strip.
+_PALETTE_SAMPLE_FRAMES = 16
+_PALETTE_SAMPLE_PIXELS = 1_000_000
+# Palette slot kept free of colours and used for transparent pixels.
+_TRANSPARENT_INDEX = 255
+# Maps alpha to a paste mask selecting pixels that are mostly transparent.
+_TRANSPARENT_ALPHA_LUT = [255] * 128 + [0] * 128
+
+
+def _build_master_palette(
+    base_gif: Image.Image, target_size: tuple[int, int], reserve_transparent: bool
+) -> Image.Image:
+    """Derive one adaptive palette from frames sampled across the whole animation.
+
+    Parameters
+    ----------
+    base_gif : Image.Image
+        Opened source GIF; it is left positioned on its last sampled frame.
+    target_size : tuple[int, int]
+        Output ``(width, height)`` in pixels; sampled frames are shrunk to at most this size
+        (smaller when needed to stay within ``_PALETTE_SAMPLE_PIXELS``).
+    reserve_transparent : bool
+        Limit the palette to 255 colours so ``_TRANSPARENT_INDEX`` stays free for
+        transparent pixels.
+
+    Returns
+    -------
+    Image.Image
+        ``"P"`` image whose palette every frame is quantized onto.
+    """
+
+    frame_count = getattr(base_gif, "n_frames", 1)
+    sample_count = min(frame_count, _PALETTE_SAMPLE_FRAMES)
+    # Evenly spaced, strictly increasing indices so the sampling walk only seeks forward.
+    step = (frame_count - 1) / max(sample_count - 1, 1)
+    indices = sorted({round(i * step) for i in range(sample_count)})
+
+    # The palette only needs representative colours, so samples are shrunk with
+    # nearest-neighbour (no blended pixels) until the whole strip fits the budget.
+    target_width, target_height = target_size
+    sample_pixels = len(indices) * target_width * target_height
+    scale = min(1.0, (_PALETTE_SAMPLE_PIXELS / sample_pixels) ** 0.5)
+    width, height = max(1, int(target_width * scale)), max(1, int(target_height * scale))
+
+    strip = Image.new("RGB", (width, height * len(indices)))
+    for row, index in enumerate(indices):
+        base_gif.seek(index)
+        sample = base_gif.resize((width, height), Image.Resampling.NEAREST)
+        strip.paste(sample.convert("RGB"), (0, row * height))
+
+    colors = _TRANSPARENT_INDEX if reserve_transparent else 256
+    return strip.convert("P", palette=Image.Palette.ADAPTIVE, colors=colors)
+
+
+def _process_frame(
+    frame: Image.Image,
+    target_size: tuple[int, int],
+    default_duration: int,
+    master_palette: Image.Image,
+    cache: Optional[_QuantizedFrameCache] = None,
+    transparent_index: Optional[int] = None,
+) -> Image.Image:
+    """Resize a single GIF frame and map it onto a palette.
+
+    Parameters
+    ----------
+    frame : Image.Image
+        Source frame as returned by ``_detach_working_frame``.
+    target_size : tuple[int, int]
+        Output ``(width, height)`` in pixels, shared by every frame of the GIF.
+    default_duration : int
+        Duration (in milliseconds) used when the frame does not carry its own.
+    master_palette : Image.Image
+        Palette image shared by every frame, as returned by ``_build_master_palette``.
+    cache : _QuantizedFrameCache, optional
+        Cache of frames already quantized onto ``master_palette``; identical resized
+        frames reuse the cached result instead of being quantized again.
+    transparent_index : int, optional
+        Palette index left unused by ``master_palette``; when given, mostly transparent
+        pixels are written with it and it is recorded as the frame's transparency.
+
+    Returns
+    -------
+    Image.Image
+        Palettized frame whose ``info["duration"]`` holds the frame duration.
+    """
+
+    frame_duration = frame.info.get("duration", default_duration)
+
+    if frame.size == target_size:
+        resized_frame = frame
+    else:
+        resized_frame = frame.resize(target_size, Image.Resampling.LANCZOS)
+
+    key = None
+    cached = None
+    if cache is not None:
+        digest = hashlib.blake2b(resized_frame.tobytes(), digest_size=16)
+        digest.update(resized_frame.mode.encode())
+        key = digest.digest()
+        cached = cache.get(key)
+
+    if cached is not None:
+        palettized = cached.copy()
+    else:
+        alpha_mask = None
+        if transparent_index is not None and resized_frame.mode == "RGBA":
+            alpha_mask = resized_frame.getchannel("A").point(_TRANSPARENT_ALPHA_LUT)
+        if resized_frame.mode not in ("RGB", "L"):
+            resized_frame = resized_frame.convert("RGB")
+
+        palettized = resized_frame.quantize(
+            palette=master_palette,
+            dither=Image.Dither.NONE,
+        )
+        if transparent_index is not None:
+            # Extend the palette up to the reserved slot, then punch transparent pixels.
+            palette = palettized.getpalette() or []
+            palette += [0] * (3 * (transparent_index + 1) - len(palette))
+            palettized.putpalette(palette)
+            if alpha_mask is not None:
+                palettized.paste(transparent_index, mask=alpha_mask)
+            palettized.info["transparency"] = transparent_index
+        if cache is not None:
+            cache.put(key, palettized.copy())
+
+    palettized.info["duration"] = frame_duration
+    return palettized
 
 
 def resize_gif(input_path: str, output_path: str, max_width: int, max_height: int) -> None:
     """Resize an animated GIF while preserving animation timing and loop configuration.
 
+    Frames are decoded, resized and palettized lazily while the output is being
+    written, so the full list of processed frames is never held in memory.
+
     Parameters
     ----------
     input_path : str
@@ -40,40 +284,76 @@ def resize_gif(input_path: str, output_path: str, max_width: int, max_height: in
         base_loop = base_gif.info.get("loop", 0)
         base_disposal = base_gif.info.get("disposal", 2)
         transparency = base_gif.info.get("transparency")
-
-        frames: List[Image.Image] = []
-        durations: List[int] = []
-
-        for frame in ImageSequence.Iterator(base_gif):
-            frame_duration = frame.info.get("duration", base_duration)
-            durations.append(frame_duration)
-
-            frame_rgba = frame.convert("RGBA")
-            resized_frame = ImageOps.contain(
-                frame_rgba,
-                size=(max_width, max_height),
-                method=Image.Resampling.LANCZOS,
-            )
-
-            palettized = resized_frame.convert("P", palette=Image.Palette.ADAPTIVE)
-            frames.append(palettized)
-
-        if not frames:
+        # All frames share the logical screen size, so the target is computed once.
+        target_size = _fit_size(base_gif.size, max_width, max_height)
+        # The source transparency index refers to the source palette; output frames use
+        # a reserved slot of the shared palette instead.
+        transparent_index = _TRANSPARENT_INDEX if transparency is not None else None
+
+        # One adaptive palette sampled from the whole animation and shared by every
+        # frame, so the quantizer runs once, colours that only appear in later frames
+        # survive, and the encoder can use a single global palette.
+        master_palette = _build_master_palette(
+            base_gif, target_size, reserve_transparent=transparent_index is not None
+        )
+
+        # Frames are only ever visited in increasing order: Pillow's GIF seek decodes
+        # forward from the current frame and rewinds only on backward seeks, so this
+        # walk stays linear in the frame count. Do not seek backwards inside it
+        # (the iterator's initial seek to frame 0 is the single rewind after sampling).
+        source_frames = ImageSequence.Iterator(base_gif)
+        first_source = next(source_frames, None)
+        if first_source is None:
             raise ValueError("No frames were extracted from the GIF; input may be corrupt.")
 
+        first_frame = _process_frame(
+            _detach_working_frame(first_source),
+            target_size,
+            base_duration,
+            master_palette,
+            transparent_index=transparent_index,
+        )
+
+        def _remaining_frames() -> Iterator[Image.Image]:
+            # Pillow releases the GIL while resampling and quantizing, so frames are
+            # processed on a thread pool. Decoding stays sequential (seeking mutates
+            # ``base_gif``), and a bounded window of in-flight frames keeps output
+            # order and memory use in check.
+            max_workers = os.cpu_count() or 1
+            pending: Deque[Future[Image.Image]] = deque()
+            # Runs of identical frames (static slides, paused motion) are quantized once.
+            cache = _QuantizedFrameCache(max_entries=2 * max_workers)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for frame in source_frames:
+                    pending.append(
+                        pool.submit(
+                            _process_frame,
+                            _detach_working_frame(frame),
+                            target_size,
+                            base_duration,
+                            master_palette,
+                            cache,
+                            transparent_index,
+                        )
+                    )
+                    if len(pending) >= 2 * max_workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+
+        # Per-frame durations travel in each frame's ``info`` so they can be streamed.
         save_kwargs = {
             "save_all": True,
-            "append_images": frames[1:],
+            "append_images": _remaining_frames(),
             "loop": base_loop,
-            "duration": durations,
             "disposal": base_disposal,
             "optimize": True,
         }
 
-        if transparency is not None:
-            save_kwargs["transparency"] = transparency
+        if transparent_index is not None:
+            save_kwargs["transparency"] = transparent_index
 
-        frames[0].save(str(output_gif), **save_kwargs)
+        first_frame.save(str(output_gif), **save_kwargs)
 
 
 def display_size_report(input_path: str, output_path: str) -> None:
@@ -98,8 +378,13 @@ def display_size_report(input_path: str, output_path: str) -> None:
     def _inspect(path: Path) -> tuple[int, tuple[int, int]]:
         if not path.exists():
             raise FileNotFoundError(f"GIF not found: {path}")
-        with Image.open(str(path)) as gif_image:
-            return path.stat().st_size, gif_image.size
+        # Read the logical screen size from the header instead of opening a decoder.
+        with open(path, "rb") as gif_file:
+            header = gif_file.read(10)
+        if len(header) < 10 or header[:6] not in (b"GIF87a", b"GIF89a"):
+            raise ValueError(f"Not a GIF file: {path}")
+        width, height = struct.unpack("<HH", header[6:10])
+        return path.stat().st_size, (width, height)
 
     original_bytes, original_dims = _inspect(input_gif)
     resized_bytes, resized_dims = _inspect(output_gif)
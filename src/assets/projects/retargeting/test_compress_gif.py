@@ -0,0 +1,51 @@
+"""Regression checks for ``compress_gif.resize_gif``."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from PIL import Image, ImageSequence
+
+from compress_gif import resize_gif
+
+COLOURS = [(255, 0, 0), (0, 0, 255), (0, 255, 0), (255, 255, 0)]
+
+
+def _write_gif(path: Path, frames: list[Image.Image], **kwargs) -> None:
+    frames[0].save(str(path), save_all=True, append_images=frames[1:], duration=50, loop=0, **kwargs)
+
+
+def test_colours_introduced_after_first_frame_survive(tmp_path: Path) -> None:
+    """A GIF cycling red -> blue -> green -> yellow must keep all four colours."""
+
+    source = tmp_path / "colours.gif"
+    output = tmp_path / "colours_resized.gif"
+    _write_gif(source, [Image.new("RGB", (200, 100), COLOURS[i // 5]) for i in range(20)])
+
+    resize_gif(str(source), str(output), max_width=100, max_height=100)
+
+    with Image.open(str(output)) as gif:
+        assert gif.size == (100, 50)
+        colours = [frame.convert("RGB").getpixel((10, 10)) for frame in ImageSequence.Iterator(gif)]
+    assert colours == COLOURS
+
+
+def test_transparency_is_preserved(tmp_path: Path) -> None:
+    """Transparent areas stay transparent and opaque areas keep their colour."""
+
+    source = tmp_path / "transparent.gif"
+    output = tmp_path / "transparent_resized.gif"
+    frames = []
+    for i in range(6):
+        frame = Image.new("RGBA", (200, 100), (0, 0, 0, 0))
+        frame.paste(COLOURS[i % len(COLOURS)] + (255,), (i * 20, 20, i * 20 + 60, 80))
+        frames.append(frame)
+    _write_gif(source, frames, disposal=2)
+
+    resize_gif(str(source), str(output), max_width=100, max_height=100)
+
+    with Image.open(str(output)) as gif:
+        for i, frame in enumerate(ImageSequence.Iterator(gif)):
+            rgba = frame.convert("RGBA")
+            assert rgba.getpixel((i * 10 + 15, 25)) == COLOURS[i % len(COLOURS)] + (255,)
+            assert rgba.getpixel((95, 5))[3] == 0